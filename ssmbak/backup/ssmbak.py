@@ -16,14 +16,14 @@ logger = logging.getLogger(__name__)
 logger.setLevel(getattr(logging, LEVEL))
 
 
-def process_message(body: str) -> dict[str, Union[str, datetime]]:
+def process_message(body: Union[str, dict]) -> dict[str, Union[str, datetime]]:
     """Transforms a message from EventBridge (via SQS) to friendly format.
 
     NOTE: for some reason only top-level key names arrive without a
     prepending slash. In that case, we prepend at the note PREPEND.
 
     Arguments:
-      body: json-formatted string from the event
+      body: json-formatted string from the event, or it already parsed
 
     Returns:
 
@@ -37,7 +37,7 @@ def process_message(body: str) -> dict[str, Union[str, datetime]]:
       }
     """
     logger.debug("body: %s", body)
-    message = json.loads(body)
+    message = body if isinstance(body, dict) else json.loads(body)
     logger.debug("message: %s", message)
     checktime = datetime.strptime(message["time"], "%Y-%m-%dT%H:%M:%SZ").replace(
         tzinfo=timezone.utc
@@ -94,8 +94,9 @@ class Resource:
           version: dict of s3 version with processed tagset.
         """
         try:
-            ssmbak_time = datetime.fromtimestamp(int(version["tagset"]["ssmbakTime"]))
-            tagtime = ssmbak_time.astimezone(timezone.utc)
+            tagtime = datetime.fromtimestamp(
+                int(version["tagset"]["ssmbakTime"]), tz=timezone.utc
+            )
         except KeyError:
             tagtime = version["LastModified"]
         return tagtime
@@ -129,6 +130,20 @@ class Resource:
                 raise e
         return nice_tagset
 
+    def _version_tagset(self, version: dict) -> dict[str, str]:
+        """Tagset for a version, without asking for a delete marker's.
+
+        Arguments:
+          version: as listed by list_object_versions
+
+        Returns:
+          Same as _get_tagset, or {} for a delete marker.
+        """
+        if "Deleted" in version:
+            # delete markers can't have tags, don't ask
+            return {}
+        return self._get_tagset(version["Key"], version["VersionId"])
+
     def _make_ssm_kwargs(self, param: dict) -> dict[str, Union[str, bool]]:
         """Preps the kwargs for boto3 client ssm.put_parameter().
 
@@ -234,7 +249,11 @@ class Resource:
         paginator = self.s3.get_paginator("list_object_versions")
         # they come back most recent (LastModified) first
         Resource._CALLS["versions"] += 1
-        return paginator.paginate(Bucket=self.bucketname, Prefix=key)
+        return paginator.paginate(
+            Bucket=self.bucketname,
+            Prefix=key,
+            PaginationConfig={"PageSize": 1000},
+        )
 
     def _get_versions(
         self, key: str, checktime: datetime, recurse: bool = False
@@ -276,6 +295,7 @@ class Resource:
           }
         """
         versions = []
+        seen = set()  # keys already in versions, one page at a time
         paginated = self._get_object_versions(key)
         there_nows = self._ssmgetpath(key, recurse=recurse)
         for param_page in paginated:
@@ -293,18 +313,17 @@ class Resource:
             except KeyError:
                 logger.debug("no versions")
             if not recurse or not key.endswith("/"):
-                if key in [x["Key"] for x in to_extend + versions]:
+                if key in seen or any(x["Key"] == key for x in to_extend):
                     to_extend = [x for x in to_extend if x["Key"] == key]
                 else:
                     n = key.count("/")
                     to_extend = [x for x in to_extend if x["Key"].count("/") == n]
             for version in to_extend:
-                if version["Key"] not in [x["Key"] for x in versions]:
-                    version["tagset"] = self._get_tagset(
-                        version["Key"], version["VersionId"]
-                    )
+                if version["Key"] not in seen:
+                    version["tagset"] = self._version_tagset(version)
                     if self._tagtime(version) <= checktime:
                         versions.append(version)
+                        seen.add(version["Key"])
         return self._key_versions(versions)
 
     def _get_version_body(self, name: str, versionid: str) -> str:
@@ -7,16 +7,37 @@ import time
 
 import boto3
 import pytest
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from ssmbak.backup import ssmbak
 from ssmbak.restore.aws import Resource
 
 logger = logging.getLogger(__name__)
 
+# room in the pool for concurrent helpers, see helpers.BULK_WORKERS
+# adaptive retries back off when concurrent puts get throttled on AWS
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive"},
+    tcp_keepalive=True,
+)
 
-def pytest_configure():
+
+def pytest_addoption(parser):
+    """Slow tests only run when asked for."""
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run slow tests"
+    )
+
+
+def pytest_configure(config):
     """Effectively global vars, including some functions."""
-    pytest.test_path = "/testyssmbak"
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep tests on the same pytest-xdist worker"
+    )
+    config.addinivalue_line("markers", "slow: only runs with --runslow")
+    pytest.test_path = worker_test_path()
     try:
         pytest.region = os.environ["AWS_DEFAULT_REGION"]
         pytest.bucketname = os.environ["SSMBAK_BUCKET"]
@@ -26,12 +47,17 @@ def pytest_configure():
             f"and SSMBAK_BUCKET (={os.getenv('SSMBAK_BUCKET')}) must both be set!"
         )
         pytest.exit(1)
-    pytest.s3 = boto3.client("s3", endpoint_url=os.getenv("AWS_ENDPOINT"))
-    pytest.ssm = boto3.client("ssm", endpoint_url=os.getenv("AWS_ENDPOINT"))
+    pytest.s3 = boto3.client(
+        "s3", endpoint_url=os.getenv("AWS_ENDPOINT"), config=BOTO_CONFIG
+    )
+    pytest.ssm = boto3.client(
+        "ssm", endpoint_url=os.getenv("AWS_ENDPOINT"), config=BOTO_CONFIG
+    )
     pytest.s3res = boto3.resource(
         "s3",
         endpoint_url=os.getenv("AWS_ENDPOINT"),
         region_name=pytest.region,
+        config=BOTO_CONFIG,
     )
     pytest.check_local = check_local
     pytest.ssmgetpath = ssmgetpath
@@ -39,6 +65,37 @@ def pytest_configure():
     logging.getLogger("urllib3").setLevel(logging.INFO)
 
 
+def worker_test_path():
+    """Separate test path for each pytest-xdist worker.
+
+    Every test wipes pytest.test_path before it runs, so parallel
+    workers can't share one. Zero-padded so no worker's path is an s3
+    prefix of another's (gw1 vs gw10).
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker:
+        return "/testyssmbak"
+    return f"/testyssmbak{int(worker.lstrip('gw')):03d}"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Groups tests by backup_source for `-n auto --dist=loadgroup`.
+
+    Keeps all the hits on the local lambda container in one worker.
+    Runs before xdist's own hook, which reads the groups.
+    Skips slow tests unless --runslow.
+    """
+    skip_slow = pytest.mark.skip(reason="needs --runslow")
+    for item in items:
+        if "slow" in item.keywords and not config.getoption("--runslow"):
+            item.add_marker(skip_slow)
+        callspec = getattr(item, "callspec", None)
+        if callspec and "backup_source" in callspec.params:
+            group = callspec.params["backup_source"].__name__
+            item.add_marker(pytest.mark.xdist_group(name=group))
+
+
 def check_local():
     """Check for localstack, mainly to skip lambda tests if not."""
     return os.getenv("AWS_ENDPOINT") in [
@@ -54,13 +111,23 @@ def _wipe_s3_pages(paginated):
             versions.extend(page["Versions"])
         if "DeleteMarkers" in page:
             versions.extend(page["DeleteMarkers"])
-        for version in versions:
-            logger.debug("deleting %s %s", version["Key"], version["VersionId"])
-            pytest.s3.delete_object(
-                Bucket=pytest.bucketname,
-                Key=version["Key"],
-                VersionId=version["VersionId"],
-            )
+        if not versions:
+            continue
+        logger.debug("deleting %s versions", len(versions))
+        # a page is at most 1000, which is also delete_objects' limit
+        res = pytest.s3.delete_objects(
+            Bucket=pytest.bucketname,
+            Delete={
+                "Objects": [
+                    {"Key": x["Key"], "VersionId": x["VersionId"]} for x in versions
+                ],
+                "Quiet": True,
+            },
+        )
+        # quiet still reports the ones that failed
+        if res.get("Errors"):
+            logger.critical("wipe failed: %s", res["Errors"])
+            sys.exit(1)
 
 
 def wipe_s3():
@@ -131,11 +198,11 @@ def wipe_ssm():
         if time.time() > now + timeout:
             logger.critical("wipe timed out")
             sys.exit(1)
-        time.sleep(1)
         names = [x["Name"] for x in ssmgetpath(pytest.test_path)]
-        logger.debug("sleeping: %s", names)
-        if not names:
-            break
+        if names:
+            # usually gone on the first check, so poll rather than wait
+            logger.debug("sleeping: %s", names)
+            time.sleep(0.1)
     assert not ssmgetpath(pytest.test_path)
 
 
@@ -154,14 +221,62 @@ def ssmgetpath(path):
     return res
 
 
+def uses_moto(item):
+    """SSMBAK_MOTO runs tests with the lib as backup_source in-process.
+
+    They just need the s3 and ssm APIs. The local lambda still needs
+    the container.
+    """
+    callspec = getattr(item, "callspec", None)
+    return bool(
+        os.getenv("SSMBAK_MOTO")
+        and callspec
+        and callspec.params.get("backup_source") is ssmbak
+    )
+
+
+@pytest.fixture(scope="session")
+def warm_clients():
+    """Opens connections once so the first test doesn't pay for them."""
+    pytest.s3.list_buckets()
+    pytest.ssm.describe_parameters(MaxResults=1)
+
+
+@pytest.fixture(scope="session")
+def bucket():
+    """Creates the bucket and turns on versioning once, not per test."""
+    init_bucket()
+
+
+@pytest.fixture
+def backend(request, monkeypatch):
+    """localstack (or AWS), or moto for uses_moto tests.
+
+    For moto, AWS_ENDPOINT is dropped so the lib's clients hit it
+    too, and pytest.s3/pytest.ssm are swapped before anything is wiped.
+    """
+    if not uses_moto(request.node):
+        request.getfixturevalue("warm_clients")
+        request.getfixturevalue("bucket")
+        yield
+        return
+    moto = pytest.importorskip("moto")
+    with moto.mock_aws():
+        monkeypatch.delenv("AWS_ENDPOINT", raising=False)
+        monkeypatch.setattr(pytest, "s3", boto3.client("s3"))
+        monkeypatch.setattr(pytest, "ssm", boto3.client("ssm"))
+        init_bucket()
+        yield
+
+
 @pytest.fixture(autouse=True)
-def init_tests():
+def init_tests(request):
     """Preps each test before running.
 
     Caches are cleared for call counts, only used in testing.
     """
-    Resource(pytest.region, pytest.bucketname).clear_call_cache()
-    init_bucket()
+    request.getfixturevalue("backend")
+    Resource.clear_call_cache()
     wipe_ssm()
     wipe_s3()
     yield True
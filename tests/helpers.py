@@ -10,6 +10,7 @@ import pprint
 import random
 import string
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import pytest
@@ -19,6 +20,10 @@ from ssmbak.restore.aws import Resource
 
 pp = pprint.PrettyPrinter(indent=4)
 logger = logging.getLogger(__name__)
+# concurrent ssm calls, within conftest.BOTO_CONFIG's connection pool
+BULK_WORKERS = 20
+# real PutParameter throughput is low, so go easy outside localstack
+AWS_BULK_WORKERS = 3
 
 
 def pretty(thingy):
@@ -26,13 +31,6 @@ def pretty(thingy):
     return f"\n{pp.pformat(thingy)}\n"
 
 
-def slurp(filename):
-    """Quick file contents to string."""
-    with open(filename, encoding="utf-8") as x:
-        f = x.read()
-    return f
-
-
 def str2datetime(checktime):
     """For ease of checktime creations."""
     return datetime.strptime(checktime, "%Y-%m-%dT%H:%M:%S").replace(
@@ -40,18 +38,28 @@ def str2datetime(checktime):
     )
 
 
+# time of the events in prep_message and helper_files; immutable
+EVENT_TIME = datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc)
+# after EVENT_TIME, before any update
+IN_BETWEEN = str2datetime("2023-08-31T09:48:00")
+
+
 def update_time(action: dict) -> dict:
     """Updates time of an action to be processed by ssmabk."""
-    if "Records" in action:  # it's mock AWS
-        body = json.loads(action["Records"][0]["body"])
-        now = datetime.now(tz=timezone.utc)
-        body["time"] = now.strftime("%Y-%m-%dT%H:%M:%SZ")
-        action["Records"][0]["body"] = json.dumps(body)
-    else:
-        action["time"] = datetime.now(tz=timezone.utc)
+    action["time"] = datetime.now(tz=timezone.utc)
     return action
 
 
+def set_event_time(message: dict, when: datetime) -> dict:
+    """Sets the time of an event message before it's processed.
+
+    Works for the lib and the local lambda alike, with no json
+    round trip through the lambda's Records body.
+    """
+    message["time"] = when.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return message
+
+
 def rando(size=6, chars=string.ascii_uppercase + string.digits) -> str:
     """Quickly generates a random string so we don't hard-code keys in tests."""
     return "".join(random.choice(chars) for _ in range(size))
@@ -72,6 +80,17 @@ def prep(action: dict) -> dict:
     return kwargs
 
 
+def bulk_prep(actions: list[dict]) -> list[dict]:
+    """prep() a bunch of actions concurrently, kwargs returned in order.
+
+    Setting params is most of the setup time for tests with lots of
+    names, and they don't depend on each other.
+    """
+    workers = BULK_WORKERS if pytest.check_local() else AWS_BULK_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(prep, actions))
+
+
 def update_description(action: dict, msg: str) -> dict:
     """Update desecription of backup action."""
     logger.debug("UT action: %s", action)
@@ -122,11 +141,12 @@ def delete_params(names):
     from original source).
     """
     deleted_params = {}
+    actions = []
     for i, name in enumerate(names):
         what_type = "SecureString" if i % 5 == 0 else "String"
         message = prep_message(name, "Delete", what_type)
-        action = ssmbak.process_message(message)
-        deleted_param = prep(action)
+        actions.append(ssmbak.process_message(message))
+    for name, action, deleted_param in zip(names, actions, bulk_prep(actions)):
         updated_action = update_time(action)
         logger.debug("updated_action: %s", updated_action)
         ssmbak.backup(updated_action)
@@ -135,11 +155,13 @@ def delete_params(names):
     time.sleep(1)
     deltime = datetime.now(tz=timezone.utc)
     ## update one more
+    actions = []
     for i, name in enumerate(names):
         what_type = "SecureString" if i % 5 == 0 else "String"
         message = prep_message(name, "Update", what_type)
-        action = ssmbak.process_message(message)
-        prep(action)
+        actions.append(ssmbak.process_message(message))
+    bulk_prep(actions)
+    for action in actions:
         post_delete_action = update_time(action)
         ssmbak.backup(post_delete_action)
     # pylint: disable=fixme
@@ -147,16 +169,25 @@ def delete_params(names):
     return deltime, deleted_params
 
 
-def check_param(name, params):
-    """Check a single param against a list of keyed dicts"""
-    ssm_param = pytest.ssm.get_parameter(Name=name, WithDecryption=True)["Parameter"]
-    assert ssm_param["Value"] == params[ssm_param["Name"]]["Value"]
-    assert ssm_param["Type"] == params[ssm_param["Name"]]["Type"]
-    param_desc = pytest.ssm.describe_parameters(
-        ParameterFilters=[{"Key": "Name", "Option": "Equals", "Values": [name]}]
-    )["Parameters"][0]
-    if "Description" in params[ssm_param["Name"]]:
-        assert param_desc["Description"] == params[ssm_param["Name"]]["Description"]
+def check_params(names, params):
+    """Check params for names against keyed dicts, ten names per call."""
+    batch_size = 10
+    chunks = [names[x : x + batch_size] for x in range(0, len(names), batch_size)]
+    for chunk in chunks:
+        res = pytest.ssm.get_parameters(Names=chunk, WithDecryption=True)
+        assert not res["InvalidParameters"]
+        paginator = pytest.ssm.get_paginator("describe_parameters")
+        descs = paginator.paginate(
+            ParameterFilters=[{"Key": "Name", "Option": "Equals", "Values": chunk}]
+        ).build_full_result()["Parameters"]
+        keyed_descs = {x["Name"]: x for x in descs}
+        for ssm_param in res["Parameters"]:
+            param = params[ssm_param["Name"]]
+            assert ssm_param["Value"] == param["Value"]
+            assert ssm_param["Type"] == param["Type"]
+            if "Description" in param:
+                param_desc = keyed_descs[ssm_param["Name"]]
+                assert param_desc["Description"] == param["Description"]
 
 
 def create_and_check(names):
@@ -165,13 +196,14 @@ def create_and_check(names):
     Quickly checks them before returning.
     """
     initial_params = {}
+    actions = []
     for i, name in enumerate(names):
         # throw in some descriptions and types
         description = (i % 3 == 0) or False
         what_type = "SecureString" if i % 5 == 0 else "String"
         message = prep_message(name, "Create", what_type, description=description)
-        action = ssmbak.process_message(message)
-        initial_param = prep(action)
+        actions.append(ssmbak.process_message(message))
+    for name, action, initial_param in zip(names, actions, bulk_prep(actions)):
         logger.debug("initial_param: %s", pretty(initial_param))
         initial_params[name] = initial_param
         logger.debug("action: %s", pretty(action))
@@ -188,7 +220,7 @@ def create_and_check(names):
         assert ssm_param["Type"] == initial_param["Type"]
         if "Description" in ssm_param_desc:
             assert ssm_param_desc["Description"] == initial_param["Description"]
-        pytest.s3.get_object(Bucket=pytest.bucketname, Key=action["name"])
+        pytest.s3.head_object(Bucket=pytest.bucketname, Key=action["name"])
     return initial_params
 
 
@@ -199,13 +231,14 @@ def update_and_check(names):
     descriptions and types to make sure nothing slips through.
     """
     updated_params = {}
+    actions = []
     for i, name in enumerate(names):
         # throw in some descriptions and types
         description = (i % 5 == 0) or False
         what_type = "SecureString" if i % 5 == 0 else "String"
         message = prep_message(name, "Update", what_type, description=description)
-        action = ssmbak.process_message(message)
-        updated_param = prep(action)
+        actions.append(ssmbak.process_message(message))
+    for name, action, updated_param in zip(names, actions, bulk_prep(actions)):
         updated_params[name] = updated_param
         updated_action = update_time(action)
         logger.debug(updated_action)
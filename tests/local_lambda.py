@@ -1,6 +1,8 @@
 """Alternative to ssmbak.backup for more thorough integration testing."""
 
+import json
 import logging
+from typing import Union
 
 import requests
 
@@ -20,8 +22,10 @@ def backup(action):
     return r
 
 
-def process_message(body: str) -> dict:
+def process_message(body: Union[str, dict]) -> dict:
     """Message is encapsulated when coming in from EventBridge via SQS."""
+    if isinstance(body, dict):
+        body = json.dumps(body)
     message = {
         "Records": [
             {
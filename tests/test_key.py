@@ -1,7 +1,6 @@
 """The main restore test."""
 
 import logging
-from datetime import datetime, timezone
 
 import pytest
 
@@ -17,7 +16,7 @@ def test_key_not_path():
     similar_name = f"{name}a"
     initial_params = helpers.create_and_check([name, similar_name])
     helpers.update_and_check([name])
-    in_between = helpers.str2datetime("2023-08-31T09:48:00")
+    in_between = helpers.IN_BETWEEN
     key = Path(
         name,
         in_between,
@@ -35,7 +34,7 @@ def test_key_not_path():
 #     name = pytest.test_path.lstrip("/")
 #     logger.warning(name)
 #     initial_params = helpers.create_and_check([name])
-#     in_between = helpers.str2datetime("2023-08-31T09:48:00")
+#     in_between = helpers.IN_BETWEEN
 #     key = Path(
 #         name,
 #         in_between,
@@ -55,7 +54,7 @@ def test_key():
     name = f"{pytest.test_path}/{helpers.rando()}"
     initial_params = helpers.create_and_check([name])
     helpers.update_and_check([name])
-    in_between = helpers.str2datetime("2023-08-31T09:48:00")
+    in_between = helpers.IN_BETWEEN
     key = Path(
         name,
         in_between,
@@ -66,12 +65,10 @@ def test_key():
     previews = key.preview()
     assert [x["Name"] for x in previews] == [name]
     helpers.compare_previews_with_params(previews, initial_params)
-    assert {x["Modified"] for x in previews} == {
-        datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc)
-    }
+    assert {x["Modified"] for x in previews} == {helpers.EVENT_TIME}
     logger.info("restore, which uses preview")
     assert key.restore() == previews
-    helpers.check_param(name, initial_params)
+    helpers.check_params([name], initial_params)
     # deleted
     deltime, deleted_params = helpers.delete_params([name])
     logger.info("deleted_params %s", deleted_params)
@@ -111,12 +108,12 @@ def test_tz_plus():
         "Name": name,
         "Value": initial_params[name]["Value"],
         "Type": initial_params[name]["Type"],
-        "Modified": datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc),
+        "Modified": helpers.EVENT_TIME,
     }
     if "Description" in initial_params[name]:
         kwargs["Description"] = initial_params[name]["Description"]
     assert preview == kwargs
-    in_between = helpers.str2datetime("2023-08-31T09:48:00")
+    in_between = helpers.IN_BETWEEN
     path = Path(name, in_between, pytest.region, pytest.bucketname)
     logger.debug(helpers.pretty(preview))
     path.restore()
@@ -1,7 +1,6 @@
 """The main restore test."""
 
 import logging
-from datetime import datetime, timezone
 
 import pytest
 
@@ -11,17 +10,19 @@ from tests import helpers
 logger = logging.getLogger(__name__)
 
 
-def get_names(recurse):
+def get_names(recurse, scale=11):
     """Generates a bunch of key names, deeper ones for recurse."""
-    names = [f"{pytest.test_path}/{helpers.rando()}" for x in range(11)]
+    names = [f"{pytest.test_path}/{helpers.rando()}" for x in range(scale)]
     if recurse:
-        names.extend(f"{pytest.test_path}/foofers/{helpers.rando()}" for x in range(11))
+        names.extend(
+            f"{pytest.test_path}/foofers/{helpers.rando()}" for x in range(scale)
+        )
     return names
 
 
 def test_noparams():
     """Make sure doesn't bomb when no params are there_now."""
-    in_between = helpers.str2datetime("2023-08-31T09:48:00")
+    in_between = helpers.IN_BETWEEN
     path = Path(
         f"{pytest.test_path}/",
         in_between,
@@ -32,21 +33,40 @@ def test_noparams():
     path.preview()
 
 
-@pytest.mark.parametrize("recurse", [True, False])
-def test_path(recurse):
-    """Parametrized for recurse and not.
+# a page of list_object_versions
+VERSIONS_PAGE = 1000
+
+
+# 501 keys with two versions each spill past a page of list_object_versions,
+# once is enough so not with recurse, which would double it
+@pytest.mark.parametrize(
+    "recurse,scale",
+    [
+        pytest.param(True, 11, marks=pytest.mark.slow),
+        (False, 11),
+        pytest.param(False, 501, marks=pytest.mark.slow),
+    ],
+)
+def test_path(recurse, scale):
+    """Parametrized for recurse and not, and for more than one page of versions.
 
     Didn't make sense to split up in favor of continuously reusing state.
     """
-    names = get_names(recurse)
+    names = get_names(recurse, scale)
     logger.info("create backups and params")
     initial_params = helpers.create_and_check(names)
     # set a path that's also a key but don't include
     helpers.create_and_check([pytest.test_path])
     logger.info("update some")
     helpers.update_and_check(names)
+    # a third version on the first key ends a full page mid-key, newest
+    # version on one page and the one from before in_between on the next
+    helpers.update_and_check(sorted(names)[:1])
+    straddler = None
+    if len(names) * 2 > VERSIONS_PAGE:
+        straddler = sorted(names)[(VERSIONS_PAGE - 1) // 2]
     # check that restore() returns originals
-    in_between = helpers.str2datetime("2023-08-31T09:48:00")
+    in_between = helpers.IN_BETWEEN
     path = Path(
         f"{pytest.test_path}/",
         in_between,
@@ -59,13 +79,16 @@ def test_path(recurse):
     assert len(previews) == len(names)
     assert [x["Name"] for x in previews] == sorted(names)
     helpers.compare_previews_with_params(previews, initial_params)
-    assert {x["Modified"] for x in previews} == {
-        datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc)
-    }
+    assert {x["Modified"] for x in previews} == {helpers.EVENT_TIME}
+    if straddler:
+        assert [x["Value"] for x in previews if x["Name"] == straddler] == [
+            initial_params[straddler]["Value"]
+        ]
     logger.info("restore, which uses preview")
     assert path.restore() == previews
-    for name in names:
-        helpers.check_param(name, initial_params)
+    helpers.check_params(names, initial_params)
+    if straddler:
+        helpers.check_params([straddler], initial_params)
     n, to_deletes = helpers.delete_some(3, names)
     logger.info("delete %s (%s)", to_deletes, n)
     ## for deleted, check that it worked
@@ -1,12 +1,12 @@
 """Test suite for the lambda function, both lib and actual lambda (localstack)."""
 
+import copy
 import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
-from botocore.exceptions import ClientError
 
 from ssmbak.backup import ssmbak
 
@@ -17,44 +17,56 @@ logger = logging.getLogger(__name__)
 name = f"{pytest.test_path}/{helpers.rando()}"
 
 
+# parsed all at once rather than per test
+_HELPERS = {
+    p.stem: json.loads(p.read_text(encoding="utf-8"))
+    for p in (Path(__file__).parent / "helper_files").glob("*.json")
+}
+
+
 def slurp_helper(filename):
-    """Slurps up content of helper file with filename."""
-    return helpers.slurp(f"{Path(__file__).parent}/helper_files/{filename}.json")
+    """Parsed content of helper file with filename. Don't modify it."""
+    return _HELPERS[filename]
 
 
-def update_name(message_j, the_name):
-    """Updates key name in json string with the_name."""
-    message = json.loads(message_j)
+def build_message(template_name, the_name):
+    """Copy of the template event message with key name the_name."""
+    message = copy.deepcopy(slurp_helper(template_name))
     message["detail"]["name"] = the_name
-    return json.dumps(message)
+    return message
+
 
+def process_both(backup_source, message):
+    """Actions for the lib and for backup_source, the same one if it's the lib."""
+    action = ssmbak.process_message(message)
+    if backup_source is ssmbak:
+        return action, action
+    return action, backup_source.process_message(message)
 
-def tagtime(key: str, version: dict) -> datetime:
-    """Given a key's version, will return the time of the event's creation."""
-    if not "VersionId" in version:  # localstack weirdness?
-        version["VersionId"] = "null"
+
+def _fetch_tags(key: str, version_id: str = "null") -> tuple[dict, datetime]:
+    """Tagset of a key's version and the time of the event's creation.
+
+    Both come from one get_object_tagging, the tagset in a more
+    readable format.
+    """
     tagset = pytest.s3.get_object_tagging(
-        Bucket=pytest.bucketname, Key=key, VersionId=version["VersionId"]
+        Bucket=pytest.bucketname, Key=key, VersionId=version_id
     )["TagSet"]
-    logger.debug("tagset: %s", tagset)
-    tag = [x for x in tagset if x["Key"] == "ssmbakTime"].pop()
-    logger.debug("tag: %s", tag)
-    utc_time = datetime.fromtimestamp(int(tag["Value"]), tz=timezone.utc)
-    return utc_time
+    nice_tagset = {x["Key"]: x["Value"] for x in tagset}
+    logger.debug("tagset: %s", nice_tagset)
+    utc_time = datetime.fromtimestamp(int(nice_tagset["ssmbakTime"]), tz=timezone.utc)
+    return nice_tagset, utc_time
 
 
-def get_tagset(key):
-    """Returns the current tagset of an s3 key in a more readable format."""
-    tagset = pytest.s3.get_object_tagging(Bucket=pytest.bucketname, Key=key)["TagSet"]
-    nice_tagset = {x["Key"]: x["Value"] for x in tagset}
-    logger.debug("get_tagset: %s", nice_tagset)
-    return nice_tagset
+def _body_eq(resp: dict, expected: str) -> bool:
+    """Compares an s3 object's body with expected, as bytes without decoding."""
+    return resp["Body"].read().strip() == expected.encode()
 
 
 def test_process_message():
     """Unit test process_message used by everything."""
-    testo = slurp_helper("create")
-    data = ssmbak.process_message(update_name(testo, name))
+    data = ssmbak.process_message(build_message("create", name))
     assert data["name"] == name
     assert data["type"] == "String"
     assert data["operation"] == "Create"
@@ -69,24 +81,20 @@ def test_backup_create_root_pathkey(backup_source):
     noslash = pytest.test_path.lstrip("/").rstrip("/")
     if backup_source == local_lambda and not pytest.check_local():
         pytest.skip()
-    testo = slurp_helper("create")
-    action = ssmbak.process_message(update_name(testo, noslash))
-    backup_action = getattr(backup_source, "process_message")(
-        update_name(testo, noslash)
+    action, backup_action = process_both(
+        backup_source, build_message("create", noslash)
     )
     new_stuff = helpers.prep(action)
-    getattr(backup_source, "backup")(backup_action)
+    backup_source.backup(backup_action)
     version = pytest.s3.get_object(Bucket=pytest.bucketname, Key=action["name"])
     logger.debug("version: %s", version)
     assert version["ResponseMetadata"]["HTTPStatusCode"] == 200
-    tagset = get_tagset(action["name"])
+    tagset, taggy = _fetch_tags(action["name"], version.get("VersionId", "null"))
     assert tagset["ssmbakType"] == action["type"]
-    stuff = version["Body"].read().decode("utf-8").strip()
-    assert stuff == new_stuff["Value"]
+    assert _body_eq(version, new_stuff["Value"])
     # not the best test, but cya
-    taggy = tagtime(action["name"], version)
     logger.debug(taggy)
-    assert taggy == datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc)
+    assert taggy == helpers.EVENT_TIME
 
 
 @pytest.mark.parametrize("backup_source", [local_lambda, ssmbak])
@@ -101,22 +109,18 @@ def test_backup_create(backup_source, totest):
     """
     if backup_source == local_lambda and not pytest.check_local():
         pytest.skip()
-    testo = slurp_helper(totest)
-    action = ssmbak.process_message(update_name(testo, name))
-    backup_action = getattr(backup_source, "process_message")(update_name(testo, name))
+    action, backup_action = process_both(backup_source, build_message(totest, name))
     new_stuff = helpers.prep(action)
-    getattr(backup_source, "backup")(backup_action)
+    backup_source.backup(backup_action)
     version = pytest.s3.get_object(Bucket=pytest.bucketname, Key=action["name"])
     logger.debug("version: %s", version)
     assert version["ResponseMetadata"]["HTTPStatusCode"] == 200
-    tagset = get_tagset(action["name"])
+    tagset, taggy = _fetch_tags(action["name"], version.get("VersionId", "null"))
     assert tagset["ssmbakType"] == action["type"]
-    stuff = version["Body"].read().decode("utf-8").strip()
-    assert stuff == new_stuff["Value"]
+    assert _body_eq(version, new_stuff["Value"])
     # not the best test, but cya
-    taggy = tagtime(action["name"], version)
     logger.debug(taggy)
-    assert taggy == datetime(2022, 8, 3, 21, 9, 31, tzinfo=timezone.utc)
+    assert taggy == helpers.EVENT_TIME
 
 
 def check_description(check_tagset: dict, action: dict) -> bool:
@@ -148,20 +152,19 @@ def test_backup_update(backup_source, totest):
     """
     if backup_source == local_lambda and not pytest.check_local():
         pytest.skip()
-    testo = slurp_helper(totest)
-    action = ssmbak.process_message(update_name(testo, name))
-    backup_action = getattr(backup_source, "process_message")(update_name(testo, name))
+    message = helpers.set_event_time(
+        build_message(totest, name), datetime.now(tz=timezone.utc)
+    )
+    action, backup_action = process_both(backup_source, message)
     new_stuff = helpers.prep(action)
-    getattr(backup_source, "backup")(helpers.update_time(backup_action))
+    backup_source.backup(backup_action)
     now = datetime.now(tz=timezone.utc)
     logger.debug("now: %s", now)
     check = pytest.s3.get_object(Bucket=pytest.bucketname, Key=action["name"])
-    check_tagset = get_tagset(action["name"])
-    stuff = check["Body"].read().decode("utf-8").strip()
-    assert stuff == new_stuff["Value"]
+    check_tagset, taggy = _fetch_tags(action["name"], check.get("VersionId", "null"))
+    assert _body_eq(check, new_stuff["Value"])
     assert check_tagset["ssmbakType"] == action["type"]
     assert check_description(check_tagset, action)
-    taggy = tagtime(action["name"], check)
     logger.debug(taggy)
     diff = now - taggy
     assert diff.seconds < 60
@@ -176,19 +179,15 @@ def test_backup_delete(backup_source):
     """
     if backup_source == local_lambda and not pytest.check_local():
         pytest.skip()
-    testo = slurp_helper("delete")
-    backup_action = getattr(backup_source, "process_message")(update_name(testo, name))
-    action = ssmbak.process_message(update_name(testo, name))
+    action, backup_action = process_both(backup_source, build_message("delete", name))
     helpers.prep(action)
-    getattr(backup_source, "backup")(backup_action)
-    ssmbak.backup(action)
-    there = True
-    try:
-        pytest.s3.get_object(Bucket=pytest.bucketname, Key=action["name"])
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "NoSuchKey":
-            there = False
-    assert not there
+    backup_source.backup(backup_action)
+    # raises WaiterError if it's still there
+    pytest.s3.get_waiter("object_not_exists").wait(
+        Bucket=pytest.bucketname,
+        Key=action["name"],
+        WaiterConfig={"Delay": 0.2, "MaxAttempts": 10},
+    )
 
 
 @pytest.mark.parametrize("backup_source", [local_lambda, ssmbak])
@@ -196,13 +195,11 @@ def test_backup_create_noparam(backup_source):
     """I can't remember why I did this."""
     if backup_source == local_lambda and not pytest.check_local():
         pytest.skip()
-    testo = slurp_helper("create")
-    action = ssmbak.process_message(update_name(testo, name))
-    backup_action = getattr(backup_source, "process_message")(update_name(testo, name))
+    action, backup_action = process_both(backup_source, build_message("create", name))
     logger.debug("action: %s", action)
     helpers.prep(action)
     pytest.ssm.delete_parameter(Name=action["name"])
-    res = getattr(backup_source, "backup")(backup_action)
+    res = backup_source.backup(backup_action)
     if backup_source == local_lambda:
         # this means nothing with localstack
         assert res.status_code == 200